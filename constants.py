@@ -0,0 +1,11 @@
+"""
+Размеры игрового поля.
+Модуль не зависит от pygame: его используют и игра, и моделирование
+без отрисовки (snake_sim).
+"""
+
+# Константы для размеров поля и сетки:
+SCREEN_WIDTH, SCREEN_HEIGHT = 640, 480
+GRID_SIZE = 20
+GRID_WIDTH = SCREEN_WIDTH // GRID_SIZE
+GRID_HEIGHT = SCREEN_HEIGHT // GRID_SIZE
@@ -0,0 +1,292 @@
+"""
+Быстрое моделирование змейки без отрисовки (для автоигры и обучения).
+
+Состояние хранится в заранее выделенных массивах numpy: тело змейки -
+кольцевой буфер координат ячеек (int16), занятость поля - булева сетка.
+Функции шага компилируются numba, если она установлена; без нее код
+работает как обычный Python. Класс SnakeBatch ведет сразу много змеек
+и выполняет их ходы векторно средствами numpy.
+"""
+import numpy as np
+
+from constants import GRID_HEIGHT, GRID_WIDTH
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """Заменяет декоратор numba.njit, если numba не установлена."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# Максимальная длина змейки - все поле:
+MAX_LEN = GRID_WIDTH * GRID_HEIGHT
+
+# Тип координат ячеек: размеры поля намного меньше 2 ** 15.
+POS_DTYPE = np.int16
+
+# Направления движения в ячейках (вверх, вниз, влево, вправо):
+DIRECTIONS = np.array(((0, -1), (0, 1), (-1, 0), (1, 0)), dtype=POS_DTYPE)
+
+# Индекс начального направления (вправо), как в игре:
+START_DIRECTION = 3
+
+
+@njit(cache=True)
+def step(positions, head_idx, tail_idx, length, occ, dir_x, dir_y, apple_xy):
+    """
+    Выполняет один ход змейки по тем же правилам, что и Snake.move в игре.
+    Хвост отбрасывается, если змейка уже достигла длины length, поэтому
+    после съеденного яблока она вырастает только на следующем ходу.
+    Args:
+        positions (ndarray): Кольцевой буфер ячеек тела, int16[MAX_LEN, 2]
+        head_idx (int): Индекс головы в буфере
+        tail_idx (int): Индекс хвоста в буфере
+        length (int): Длина, до которой растет змейка
+        occ (ndarray): Занятость поля, bool[GRID_WIDTH, GRID_HEIGHT]
+        dir_x (int): Направление по горизонтали (-1, 0, 1)
+        dir_y (int): Направление по вертикали (-1, 0, 1)
+        apple_xy (ndarray): Ячейка яблока, int16[2]
+    Returns:
+        tuple: (head_idx, tail_idx, length, ate, died) после хода
+    """
+    max_len = positions.shape[0]
+    width, height = occ.shape
+    new_x = positions[head_idx, 0] + dir_x
+    new_y = positions[head_idx, 1] + dir_y
+    if new_x >= width:
+        new_x -= width
+    elif new_x < 0:
+        new_x += width
+    if new_y >= height:
+        new_y -= height
+    elif new_y < 0:
+        new_y += height
+
+    cells = tail_idx - head_idx + 1
+    if cells <= 0:
+        cells += max_len
+    if cells >= length:
+        occ[positions[tail_idx, 0], positions[tail_idx, 1]] = False
+        tail_idx -= 1
+        if tail_idx < 0:
+            tail_idx += max_len
+
+    died = occ[new_x, new_y]
+    head_idx -= 1
+    if head_idx < 0:
+        head_idx += max_len
+    positions[head_idx, 0] = new_x
+    positions[head_idx, 1] = new_y
+    occ[new_x, new_y] = True
+
+    ate = not died and new_x == apple_xy[0] and new_y == apple_xy[1]
+    if ate:
+        length += 1
+    return head_idx, tail_idx, length, ate, died
+
+
+@njit(cache=True)
+def random_below(rng_state, bound):
+    """
+    Возвращает псевдослучайное целое число из [0, bound).
+    Используется линейный конгруэнтный генератор, а не np.random: numba
+    и numpy генерируют разные последовательности, а так результат
+    моделирования не зависит от того, установлена ли numba.
+    Args:
+        rng_state (ndarray): Состояние генератора, int64[1], меняется на месте
+        bound (int): Верхняя граница (не включается)
+    """
+    rng_state[0] = (rng_state[0] * 1103515245 + 12345) & 0x7FFFFFFF
+    return (rng_state[0] >> 8) % bound
+
+
+@njit(cache=True)
+def place_apple(occ, apple_xy, rng_state):
+    """
+    Ставит яблоко в случайную свободную ячейку без повторных попыток.
+    Args:
+        occ (ndarray): Занятость поля, bool[GRID_WIDTH, GRID_HEIGHT]
+        apple_xy (ndarray): Ячейка яблока, заполняется на месте
+        rng_state (ndarray): Состояние генератора, int64[1]
+    Returns:
+        bool: False, если свободных ячеек не осталось
+    """
+    width, height = occ.shape
+    free = width * height - occ.sum()
+    if free <= 0:
+        return False
+    skip = random_below(rng_state, free)
+    for x in range(width):
+        for y in range(height):
+            if not occ[x, y]:
+                if skip == 0:
+                    apple_xy[0] = x
+                    apple_xy[1] = y
+                    return True
+                skip -= 1
+    return False
+
+
+@njit(cache=True)
+def reset_state(positions, occ, apple_xy, rng_state):
+    """
+    Возвращает змейку длины 1 в центр поля и ставит новое яблоко.
+    Returns:
+        tuple: (head_idx, tail_idx, length)
+    """
+    width, height = occ.shape
+    occ[:, :] = False
+    positions[0, 0] = width // 2
+    positions[0, 1] = height // 2
+    occ[width // 2, height // 2] = True
+    place_apple(occ, apple_xy, rng_state)
+    return 0, 0, 1
+
+
+@njit(cache=True)
+def run_random_steps(positions, occ, apple_xy, directions, n, seed):
+    """
+    Моделирует n ходов со случайной сменой направления.
+    Returns:
+        tuple: (количество съеденных яблок, количество столкновений)
+    """
+    rng_state = np.full(1, seed & 0x7FFFFFFF, dtype=np.int64)
+    head_idx, tail_idx, length = reset_state(
+        positions, occ, apple_xy, rng_state
+    )
+    direction = START_DIRECTION
+    eaten = 0
+    deaths = 0
+    for _ in range(n):
+        turn = random_below(rng_state, len(directions))
+        # Разворот на 180 градусов запрещен, как и в игре.
+        if turn // 2 != direction // 2:
+            direction = turn
+        head_idx, tail_idx, length, ate, died = step(
+            positions, head_idx, tail_idx, length, occ,
+            directions[direction, 0], directions[direction, 1], apple_xy,
+        )
+        if died:
+            deaths += 1
+            head_idx, tail_idx, length = reset_state(
+                positions, occ, apple_xy, rng_state
+            )
+        elif ate:
+            eaten += 1
+            if not place_apple(occ, apple_xy, rng_state):
+                head_idx, tail_idx, length = reset_state(
+                    positions, occ, apple_xy, rng_state
+                )
+    return eaten, deaths
+
+
+def simulate_steps(n, seed=0):
+    """
+    Моделирует n ходов змейки без отрисовки.
+    Args:
+        n (int): Количество ходов
+        seed (int): Зерно генератора случайных чисел
+    Returns:
+        tuple: (количество съеденных яблок, количество столкновений)
+    """
+    positions = np.zeros((MAX_LEN, 2), dtype=POS_DTYPE)
+    occ = np.zeros((GRID_WIDTH, GRID_HEIGHT), dtype=np.bool_)
+    apple_xy = np.zeros(2, dtype=POS_DTYPE)
+    return run_random_steps(positions, occ, apple_xy, DIRECTIONS, n, seed)
+
+
+class SnakeBatch:
+    """
+    Набор независимых змеек, ходы которых выполняются векторно.
+    Состояние i-й змейки - строка i во всех массивах, поэтому один вызов
+    step двигает все змейки сразу, без цикла Python по змейкам.
+    lengths - длина, до которой растет змейка; число ячеек тела равно
+    (tail_idx - head_idx) % MAX_LEN + 1.
+    """
+
+    def __init__(self, size, seed=None):
+        """
+        Создает size змеек в начальном состоянии.
+        Args:
+            size (int): Количество змеек
+            seed (int): Зерно генератора случайных чисел
+        """
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+        self.positions = np.zeros((size, MAX_LEN, 2), dtype=POS_DTYPE)
+        self.occ = np.zeros((size, GRID_WIDTH, GRID_HEIGHT), dtype=np.bool_)
+        self.apples = np.zeros((size, 2), dtype=POS_DTYPE)
+        self.head_idx = np.zeros(size, dtype=np.intp)
+        self.tail_idx = np.zeros(size, dtype=np.intp)
+        self.lengths = np.ones(size, dtype=np.intp)
+        self.directions = np.full(size, START_DIRECTION, dtype=np.intp)
+        self._rows = np.arange(size)
+        self.reset(self._rows)
+
+    def reset(self, rows):
+        """Возвращает змеек с индексами rows в начальное состояние."""
+        self.occ[rows] = False
+        self.positions[rows, 0] = (GRID_WIDTH // 2, GRID_HEIGHT // 2)
+        self.occ[rows, GRID_WIDTH // 2, GRID_HEIGHT // 2] = True
+        self.head_idx[rows] = 0
+        self.tail_idx[rows] = 0
+        self.lengths[rows] = 1
+        self.directions[rows] = START_DIRECTION
+        self.place_apples(rows)
+
+    def place_apples(self, rows):
+        """Ставит яблоки змеек rows в случайные свободные ячейки."""
+        for row in np.atleast_1d(rows):
+            free = np.flatnonzero(~self.occ[row].ravel())
+            if not free.size:
+                # Поле заполнено целиком - игра начинается заново.
+                self.reset(row)
+                continue
+            self.apples[row] = np.divmod(self.rng.choice(free), GRID_HEIGHT)
+
+    def heads(self):
+        """Возвращает ячейки голов всех змеек, int16[size, 2]."""
+        return self.positions[self._rows, self.head_idx]
+
+    def step(self, actions):
+        """
+        Делает один ход всеми змейками.
+        Разворот на 180 градусов игнорируется, как и в игре. Змейки,
+        столкнувшиеся с собой, сразу возвращаются в начальное состояние.
+        Args:
+            actions (ndarray): Индексы направлений в DIRECTIONS, int[size]
+        Returns:
+            tuple: Булевы массивы (ate, died) размера size
+        """
+        rows = self._rows
+        actions = np.asarray(actions)
+        turn = actions // 2 != self.directions // 2
+        self.directions = np.where(turn, actions, self.directions)
+
+        new_heads = self.heads() + DIRECTIONS[self.directions]
+        new_heads %= (GRID_WIDTH, GRID_HEIGHT)
+        new_x, new_y = new_heads[:, 0], new_heads[:, 1]
+
+        # Как и в игре, хвост отбрасывается, если змейка уже достигла
+        # длины lengths, а съеденное яблоко удлиняет ее на следующем ходу.
+        cells = (self.tail_idx - self.head_idx) % MAX_LEN + 1
+        moved = rows[cells >= self.lengths]
+        tails = self.positions[moved, self.tail_idx[moved]]
+        self.occ[moved, tails[:, 0], tails[:, 1]] = False
+        self.tail_idx[moved] = (self.tail_idx[moved] - 1) % MAX_LEN
+
+        died = self.occ[rows, new_x, new_y]
+        self.head_idx = (self.head_idx - 1) % MAX_LEN
+        self.positions[rows, self.head_idx] = new_heads
+        self.occ[rows, new_x, new_y] = True
+        ate = ~died & (new_heads == self.apples).all(axis=1)
+        self.lengths += ate
+
+        if died.any():
+            self.reset(rows[died])
+        eaten = rows[ate & ~died]
+        if eaten.size:
+            self.place_apples(eaten)
+        return ate, died
@@ -0,0 +1,144 @@
+from collections import deque
+
+import pytest
+
+from conftest import StopInfiniteLoop
+from constants import GRID_SIZE, SCREEN_HEIGHT, SCREEN_WIDTH
+
+
+def test_snake_occupied_cells_follow_body(snake, _the_snake):
+    snake.length = 4
+    for direction in (
+        _the_snake.RIGHT, _the_snake.RIGHT, _the_snake.DOWN,
+        _the_snake.LEFT, _the_snake.LEFT,
+    ):
+        snake.direction = direction
+        snake.move()
+        assert snake._occupied == set(snake.positions), (
+            'Множество занятых клеток змейки должно совпадать '
+            'с её позициями.'
+        )
+        assert not snake._self_collided
+
+
+def test_snake_self_collision_flag(snake, _the_snake):
+    snake.length = 5
+    for direction in (
+        _the_snake.RIGHT, _the_snake.RIGHT, _the_snake.DOWN,
+        _the_snake.LEFT,
+    ):
+        snake.direction = direction
+        snake.move()
+    assert not snake._self_collided
+    snake.direction = _the_snake.UP
+    snake.move()
+    assert snake._self_collided, (
+        'Змейка должна фиксировать столкновение головы с телом.'
+    )
+    snake.reset()
+    assert not snake._self_collided
+    assert snake._occupied == set(snake.positions)
+
+
+def test_free_cells_discard_and_add_are_idempotent(_the_snake):
+    free_cells = _the_snake.FreeCells(_the_snake.ALL_CELLS)
+    free_cells.discard(_the_snake.CENTER_POSITION)
+    free_cells.discard(_the_snake.CENTER_POSITION)
+    assert len(free_cells) == len(_the_snake.ALL_CELLS) - 1
+    assert _the_snake.CENTER_POSITION not in free_cells
+    free_cells.add(_the_snake.CENTER_POSITION)
+    free_cells.add(_the_snake.CENTER_POSITION)
+    assert set(free_cells) == _the_snake.ALL_CELLS
+
+
+def test_free_cells_swap_remove_keeps_index(_the_snake):
+    cells = sorted(_the_snake.ALL_CELLS)
+    free_cells = _the_snake.FreeCells(cells)
+    removed = set(cells[1:-1:3])
+    for cell in removed:
+        free_cells.discard(cell)
+    remaining = set(cells) - removed
+    assert len(free_cells) == len(remaining)
+    for index, cell in enumerate(free_cells._cells):
+        assert free_cells._index[cell] == index
+    assert set(free_cells._index) == remaining
+    for _ in range(1000):
+        assert _the_snake._rng.choice(free_cells) in remaining, (
+            'Случайная ячейка должна выбираться только из свободных.'
+        )
+
+
+def test_apple_placed_only_in_free_cell(apple, _the_snake):
+    cell = (0, 0)
+    apple.randomize_position(_the_snake.FreeCells([cell]))
+    assert apple.position == cell, (
+        'Яблоко должно появляться только в свободной ячейке.'
+    )
+
+
+@pytest.mark.parametrize('direction_name, start, expected', (
+    ('RIGHT', (SCREEN_WIDTH - GRID_SIZE, 100), (0, 100)),
+    ('LEFT', (0, 100), (SCREEN_WIDTH - GRID_SIZE, 100)),
+    ('UP', (200, 0), (200, SCREEN_HEIGHT - GRID_SIZE)),
+    ('DOWN', (200, SCREEN_HEIGHT - GRID_SIZE), (200, 0)),
+    ('RIGHT', (200, 100), (220, 100)),
+))
+def test_snake_wraps_around_screen_edges(
+    snake, _the_snake, direction_name, start, expected
+):
+    snake.positions = deque([start])
+    snake._occupied = {start}
+    snake.direction = getattr(_the_snake, direction_name)
+    snake.move()
+    assert snake.get_head_position() == expected, (
+        'Выйдя за край поля, змейка должна появиться с противоположной '
+        'стороны.'
+    )
+
+
+@pytest.mark.timeout(1, method='thread')
+@pytest.mark.usefixtures('modified_clock')
+def test_main_restarts_when_board_is_full(_the_snake, monkeypatch):
+    center_x, center_y = _the_snake.CENTER_POSITION
+    free_cell = (center_x + _the_snake.GRID_SIZE, center_y)
+    monkeypatch.setattr(
+        _the_snake, 'ALL_CELLS', {_the_snake.CENTER_POSITION, free_cell}
+    )
+    created = {}
+    placements = []
+
+    class LongSnake(_the_snake.Snake):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.length = 2
+            created['snake'] = self
+
+    class TrackedApple(_the_snake.Apple):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            created['apple'] = self
+
+        def randomize_position(self, free_cells):
+            super().randomize_position(free_cells)
+            placements.append(self.position)
+
+    # Первым ходом змейка длины 2 съедает яблоко и занимает всё поле.
+    monkeypatch.setattr(_the_snake, 'Snake', LongSnake)
+    monkeypatch.setattr(_the_snake, 'Apple', TrackedApple)
+    try:
+        _the_snake.main()
+    except StopInfiniteLoop:
+        pass
+
+    snake, apple = created['snake'], created['apple']
+    assert snake.length == 1, (
+        'Заняв всё поле, змейка должна начать игру заново.'
+    )
+    assert list(snake.positions) == [_the_snake.CENTER_POSITION]
+    # Яблоко ставится при создании и ещё раз после перезапуска.
+    assert placements == [free_cell, free_cell], (
+        'После перезапуска яблоко должно быть поставлено заново.'
+    )
+    assert apple.position == free_cell, (
+        'После перезапуска яблоко должно стоять в свободной ячейке.'
+    )
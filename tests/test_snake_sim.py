@@ -0,0 +1,259 @@
+import os
+import random
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from conftest import BASE_DIR
+
+
+@pytest.fixture
+def snake_sim():
+    import snake_sim
+    return snake_sim
+
+
+def test_snake_sim_does_not_import_game():
+    code = 'import snake_sim, sys; assert "pygame" not in sys.modules'
+    subprocess.run(
+        [sys.executable, '-c', code], cwd=BASE_DIR, check=True
+    )
+
+
+def _new_state(snake_sim, head):
+    positions = np.zeros((snake_sim.MAX_LEN, 2), dtype=snake_sim.POS_DTYPE)
+    occ = np.zeros(
+        (snake_sim.GRID_WIDTH, snake_sim.GRID_HEIGHT), dtype=np.bool_
+    )
+    positions[0] = head
+    occ[head] = True
+    return positions, occ, np.zeros(2, dtype=snake_sim.POS_DTYPE)
+
+
+def test_step_moves_and_wraps(snake_sim):
+    positions = np.zeros((snake_sim.MAX_LEN, 2), dtype=snake_sim.POS_DTYPE)
+    occ = np.zeros(
+        (snake_sim.GRID_WIDTH, snake_sim.GRID_HEIGHT), dtype=np.bool_
+    )
+    apple_xy = np.array((0, 0), dtype=snake_sim.POS_DTYPE)
+    positions[0] = (snake_sim.GRID_WIDTH - 1, 5)
+    occ[snake_sim.GRID_WIDTH - 1, 5] = True
+
+    head_idx, tail_idx, length, ate, died = snake_sim.step(
+        positions, 0, 0, 1, occ, 1, 0, apple_xy
+    )
+    assert tuple(positions[head_idx]) == (0, 5)
+    assert head_idx == tail_idx and length == 1
+    assert not ate and not died
+    assert occ.sum() == 1 and occ[0, 5]
+
+
+def test_step_eats_and_collides(snake_sim):
+    positions, occ, apple_xy = _new_state(snake_sim, (5, 5))
+    apple_xy[:] = (6, 5)
+
+    state = (0, 0, 1)
+    for _ in range(4):
+        *state, ate, died = snake_sim.step(
+            positions, *state, occ, 1, 0, apple_xy
+        )
+        assert ate and not died
+        apple_xy[0] += 1
+    assert state[2] == 5
+
+    for dir_x, dir_y in ((0, 1), (-1, 0)):
+        *state, ate, died = snake_sim.step(
+            positions, *state, occ, dir_x, dir_y, apple_xy
+        )
+        assert not ate and not died
+    *state, ate, died = snake_sim.step(
+        positions, *state, occ, 0, -1, apple_xy
+    )
+    assert died
+
+
+@pytest.mark.parametrize('eat_before_turn, expected_died', (
+    (False, False),
+    (True, True),
+))
+def test_step_grows_one_move_after_eating(
+    snake_sim, eat_before_turn, expected_died
+):
+    positions, occ, apple_xy = _new_state(snake_sim, (5, 5))
+    state = (0, 0, 1)
+    moves = (
+        ((1, 0), (6, 5)), ((0, 1), (6, 6)), ((-1, 0), (5, 6)),
+        ((0, -1), (5, 5) if eat_before_turn else (0, 0)),
+    )
+    for (dir_x, dir_y), apple in moves:
+        apple_xy[:] = apple
+        *state, ate, died = snake_sim.step(
+            positions, *state, occ, dir_x, dir_y, apple_xy
+        )
+        assert not died
+    apple_xy[:] = (0, 0)
+    # Голова входит в ячейку хвоста: как и в игре, хвост освобождается,
+    # только если на прошлом ходу змейка ничего не съела.
+    *state, ate, died = snake_sim.step(
+        positions, *state, occ, 1, 0, apple_xy
+    )
+    assert died == expected_died
+
+
+def test_step_matches_game_snake(snake_sim, _the_snake):
+    rng = random.Random(0)
+    game_directions = (
+        _the_snake.UP, _the_snake.DOWN, _the_snake.LEFT, _the_snake.RIGHT,
+    )
+    grid = _the_snake.GRID_SIZE
+    snake = _the_snake.Snake()
+    start = tuple(coord // grid for coord in snake.positions[0])
+    positions, occ, apple_xy = _new_state(snake_sim, start)
+    state = (0, 0, 1)
+    eaten = deaths = 0
+    for _ in range(3000):
+        direction = rng.randrange(len(game_directions))
+        dir_x, dir_y = snake_sim.DIRECTIONS[direction]
+        head_x, head_y = snake.positions[0]
+        step_x, step_y = game_directions[direction]
+        next_cell = (
+            (head_x + step_x) % _the_snake.SCREEN_WIDTH,
+            (head_y + step_y) % _the_snake.SCREEN_HEIGHT,
+        )
+        # Яблоко часто ставится прямо перед головой, чтобы змейка росла.
+        apple = next_cell if rng.random() < 0.3 else None
+        apple_xy[:] = (
+            (next_cell[0] // grid, next_cell[1] // grid) if apple else (-1, -1)
+        )
+
+        snake.direction = game_directions[direction]
+        snake.move()
+        game_died = snake._self_collided
+        game_ate = not game_died and snake.positions[0] == apple
+        *state, ate, died = snake_sim.step(
+            positions, *state, occ, dir_x, dir_y, apple_xy
+        )
+        assert (ate, died) == (game_ate, game_died)
+
+        if game_died:
+            deaths += 1
+            snake.reset()
+            positions, occ, apple_xy = _new_state(snake_sim, start)
+            state = (0, 0, 1)
+            continue
+        if game_ate:
+            eaten += 1
+            snake.length += 1
+        head_idx, tail_idx, length = state
+        body = [
+            tuple(positions[index % snake_sim.MAX_LEN])
+            for index in range(head_idx, head_idx + len(snake.positions))
+        ]
+        assert body == [(x // grid, y // grid) for x, y in snake.positions]
+        assert length == snake.length
+        assert (tail_idx - head_idx) % snake_sim.MAX_LEN == len(body) - 1
+    assert eaten and deaths
+
+
+def test_simulate_steps_is_reproducible(snake_sim):
+    result = snake_sim.simulate_steps(20000, seed=1)
+    assert snake_sim.simulate_steps(20000, seed=1) == result
+    assert snake_sim.simulate_steps(20000, seed=2) != result
+
+
+def test_simulate_steps_eats_apples(snake_sim):
+    eaten, deaths = snake_sim.simulate_steps(20000, seed=1)
+    assert eaten > 0 and deaths > 0
+
+
+def test_simulate_steps_same_without_numba(snake_sim):
+    assert hasattr(snake_sim.run_random_steps, 'py_func'), (
+        'Функции моделирования должны компилироваться numba.'
+    )
+    code = 'import snake_sim; print(snake_sim.simulate_steps(5000, seed=3))'
+    env = dict(os.environ, NUMBA_DISABLE_JIT='1')
+    output = subprocess.run(
+        [sys.executable, '-c', code], cwd=BASE_DIR, env=env,
+        capture_output=True, text=True, check=True,
+    ).stdout
+    assert output.strip() == str(snake_sim.simulate_steps(5000, seed=3))
+
+
+def test_snake_batch_keeps_occupancy_consistent(snake_sim):
+    batch = snake_sim.SnakeBatch(8, seed=0)
+    rng = np.random.default_rng(0)
+    for _ in range(300):
+        batch.step(rng.integers(0, len(snake_sim.DIRECTIONS), batch.size))
+    assert batch.positions.dtype == np.int16
+    cells = (batch.tail_idx - batch.head_idx) % snake_sim.MAX_LEN + 1
+    for row in range(batch.size):
+        body = {
+            tuple(batch.positions[row, index % snake_sim.MAX_LEN])
+            for index in range(
+                batch.head_idx[row], batch.head_idx[row] + cells[row]
+            )
+        }
+        assert len(body) == cells[row]
+        assert batch.lengths[row] - 1 <= cells[row] <= batch.lengths[row]
+        assert body == {tuple(cell) for cell in np.argwhere(batch.occ[row])}
+        assert tuple(batch.apples[row]) not in body
+
+
+def test_snake_batch_matches_game_snake(snake_sim, _the_snake):
+    rng = random.Random(1)
+    game_directions = (
+        _the_snake.UP, _the_snake.DOWN, _the_snake.LEFT, _the_snake.RIGHT,
+    )
+    grid = _the_snake.GRID_SIZE
+    batch = snake_sim.SnakeBatch(4, seed=0)
+    snakes = [_the_snake.Snake() for _ in range(batch.size)]
+    eaten = deaths = 0
+    for _ in range(1000):
+        actions = np.array([
+            rng.choice([
+                action for action in range(len(game_directions))
+                if action // 2 != batch.directions[row] // 2
+                or action == batch.directions[row]
+            ])
+            for row in range(batch.size)
+        ])
+        next_heads = (
+            batch.heads() + snake_sim.DIRECTIONS[actions]
+        ) % (snake_sim.GRID_WIDTH, snake_sim.GRID_HEIGHT)
+        apples = []
+        for row, snake in enumerate(snakes):
+            # Яблоко часто ставится прямо перед головой, чтобы змейка росла.
+            if rng.random() < 0.3:
+                batch.apples[row] = next_heads[row]
+                apples.append(tuple(int(c) * grid for c in next_heads[row]))
+            else:
+                batch.apples[row] = (-1, -1)
+                apples.append(None)
+
+        ate, died = batch.step(actions)
+
+        for row, snake in enumerate(snakes):
+            snake.direction = game_directions[actions[row]]
+            snake.move()
+            game_died = snake._self_collided
+            game_ate = not game_died and snake.positions[0] == apples[row]
+            assert (ate[row], died[row]) == (game_ate, game_died)
+            if game_died:
+                deaths += 1
+                snake.reset()
+                continue
+            if game_ate:
+                eaten += 1
+                snake.length += 1
+            body = [
+                tuple(batch.positions[row, index % snake_sim.MAX_LEN])
+                for index in range(
+                    batch.head_idx[row],
+                    batch.head_idx[row] + len(snake.positions),
+                )
+            ]
+            assert body == [(x // grid, y // grid) for x, y in snake.positions]
+            assert batch.lengths[row] == snake.length
+    assert eaten and deaths
@@ -1,18 +1,26 @@
-from random import randint
+from collections import deque
+from random import Random
 
 import pygame
 
 # Константы для размеров поля и сетки:
-SCREEN_WIDTH, SCREEN_HEIGHT = 640, 480
-GRID_SIZE = 20
-GRID_WIDTH = SCREEN_WIDTH // GRID_SIZE
-GRID_HEIGHT = SCREEN_HEIGHT // GRID_SIZE
-
-# Направления движения:
-UP = (0, -1)
-DOWN = (0, 1)
-LEFT = (-1, 0)
-RIGHT = (1, 0)
+from constants import (
+    GRID_HEIGHT, GRID_SIZE, GRID_WIDTH, SCREEN_HEIGHT, SCREEN_WIDTH
+)
+
+# Направления движения (смещение головы за один ход, в пикселях):
+UP = (0, -GRID_SIZE)
+DOWN = (0, GRID_SIZE)
+LEFT = (-GRID_SIZE, 0)
+RIGHT = (GRID_SIZE, 0)
+
+# Клавиша -> (новое направление, противоположное ему направление):
+KEY_DIRS = {
+    pygame.K_UP: (UP, DOWN),
+    pygame.K_DOWN: (DOWN, UP),
+    pygame.K_LEFT: (LEFT, RIGHT),
+    pygame.K_RIGHT: (RIGHT, LEFT),
+}
 
 # Цвет фона - черный:
 BOARD_BACKGROUND_COLOR = (0, 0, 0)
@@ -34,6 +42,18 @@ CENTER_X = (GRID_WIDTH // 2) * GRID_SIZE
 CENTER_Y = (GRID_HEIGHT // 2) * GRID_SIZE
 CENTER_POSITION = (CENTER_X, CENTER_Y)
 
+# Все ячейки игрового поля
+ALL_CELLS = {
+    (x * GRID_SIZE, y * GRID_SIZE)
+    for x in range(GRID_WIDTH)
+    for y in range(GRID_HEIGHT)
+}
+
+# Готовые прямоугольники ячеек, чтобы не создавать их в каждом кадре
+CELL_RECTS = {
+    cell: pygame.Rect(cell, (GRID_SIZE, GRID_SIZE)) for cell in ALL_CELLS
+}
+
 # Настройка игрового окна:
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), 0, 32)
 
@@ -43,10 +63,80 @@ pygame.display.set_caption('Змейка')
 # Настройка времени:
 clock = pygame.time.Clock()
 
+# Собственный генератор случайных чисел для расстановки яблок:
+_rng = Random()
+
+
+def create_cell_surface(color):
+    """
+    Создает поверхность одной ячейки с заливкой и границей.
+    Args:
+        color (tuple): Цвет заливки ячейки
+    Returns:
+        pygame.Surface: Готовая к отрисовке поверхность ячейки
+    """
+    surface = pygame.Surface((GRID_SIZE, GRID_SIZE))
+    surface.fill(color)
+    pygame.draw.rect(surface, BORDER_COLOR, surface.get_rect(), 1)
+    return surface
+
+
+class FreeCells:
+    """
+    Набор свободных ячеек поля.
+    Ячейки хранятся в списке, а их индексы - в словаре, поэтому добавление,
+    удаление и выбор случайной ячейки выполняются за O(1).
+    """
+
+    __slots__ = ('_cells', '_index')
+
+    def __init__(self, cells=()):
+        """
+        Создает набор свободных ячеек.
+        Args:
+            cells (iterable): Начальные свободные ячейки
+        """
+        self.reset(cells)
+
+    def reset(self, cells):
+        """Заполняет набор заново переданными ячейками."""
+        self._cells = list(cells)
+        self._index = {cell: index for index, cell in enumerate(self._cells)}
+
+    def add(self, cell):
+        """Помечает ячейку как свободную."""
+        if cell not in self._index:
+            self._index[cell] = len(self._cells)
+            self._cells.append(cell)
+
+    def discard(self, cell):
+        """Помечает ячейку как занятую (удаляет последней на ее место)."""
+        index = self._index.pop(cell, None)
+        if index is None:
+            return
+        last_cell = self._cells.pop()
+        if index < len(self._cells):
+            self._cells[index] = last_cell
+            self._index[last_cell] = index
+
+    def __contains__(self, cell):
+        """Проверяет, свободна ли ячейка."""
+        return cell in self._index
+
+    def __len__(self):
+        """Возвращает количество свободных ячеек."""
+        return len(self._cells)
+
+    def __getitem__(self, index):
+        """Возвращает свободную ячейку по индексу (нужно для Random.choice)."""
+        return self._cells[index]
+
 
 class GameObject:
     """Базовый класс для всех игровых объектов."""
 
+    __slots__ = ('position', 'body_color', '_surf')
+
     def __init__(self, body_color=BOARD_BACKGROUND_COLOR):
         """
         Инициализирует базовые атрибуты объекта.
@@ -55,6 +145,19 @@ class GameObject:
         """
         self.position = CENTER_POSITION
         self.body_color = body_color
+        self._surf = create_cell_surface(body_color)
+
+    def draw_cell(self, position):
+        """
+        Отрисовывает одну ячейку объекта (заливку и границу) одним blit.
+        Args:
+            position (tuple): Координаты ячейки
+        Returns:
+            pygame.Rect: Область экрана, которую нужно обновить
+        """
+        rect = CELL_RECTS[position]
+        screen.blit(self._surf, rect)
+        return rect
 
     def draw(self):
         """
@@ -68,39 +171,50 @@ class GameObject:
 class Apple(GameObject):
     """Класс для представления яблока в игре."""
 
+    __slots__ = ()
+
     def __init__(
             self,
             body_color=APPLE_COLOR,
-            occupied_positions=(CENTER_POSITION,)
+            free_cells=None
     ):
         """
         Инициализирует яблоко.
         Args:
             body_color (tuple): Цвет яблока (по умолчанию APPLE_COLOR)
-            occupied_positions (tuple): Позиции, занятые другими объектами
+            free_cells (FreeCells): Ячейки, не занятые другими объектами
+                (по умолчанию все ячейки, кроме центра поля)
         """
         super().__init__(body_color=body_color)
-        self.randomize_position(occupied_positions)
+        if free_cells is None:
+            free_cells = FreeCells(ALL_CELLS - {CENTER_POSITION})
+        self.randomize_position(free_cells)
 
-    def randomize_position(self, occupied_positions):
-        """Устанавливает случайную позицию яблока в пределах игрового поля."""
-        while True:
-            x = randint(0, GRID_WIDTH - 1) * GRID_SIZE
-            y = randint(0, GRID_HEIGHT - 1) * GRID_SIZE
-            self.position = (x, y)
-            if self.position not in occupied_positions:
-                break
+    def randomize_position(self, free_cells):
+        """
+        Устанавливает яблоко в случайную свободную ячейку игрового поля.
+        Args:
+            free_cells (FreeCells): Ячейки, не занятые другими объектами
+        """
+        self.position = _rng.choice(free_cells)
 
     def draw(self):
-        """Отрисовывает яблоко на игровой поверхности."""
-        rect = pygame.Rect(self.position, (GRID_SIZE, GRID_SIZE))
-        pygame.draw.rect(screen, self.body_color, rect)
-        pygame.draw.rect(screen, BORDER_COLOR, rect, 1)
+        """
+        Отрисовывает яблоко на игровой поверхности.
+        Returns:
+            pygame.Rect: Область экрана, которую нужно обновить
+        """
+        return self.draw_cell(self.position)
 
 
 class Snake(GameObject):
     """Класс для представления змейки в игре."""
 
+    __slots__ = (
+        'length', 'positions', '_occupied', '_self_collided',
+        'direction', 'next_direction', 'last',
+    )
+
     def __init__(self, body_color=SNAKE_COLOR):
         """
         Инициализирует змейку.
@@ -109,9 +223,12 @@ class Snake(GameObject):
         """
         super().__init__(body_color=body_color)
         self.length = 1
-        self.positions = [self.position]
+        self.positions = deque([self.position])
+        self._occupied = {self.position}
+        self._self_collided = False
         self.direction = RIGHT
         self.next_direction = None
+        self.last = None
 
     def update_direction(self):
         """Обновляет направление движения змейки после нажатия на кнопку."""
@@ -120,22 +237,62 @@ class Snake(GameObject):
             self.next_direction = None
 
     def move(self):
-        """Обновляет позицию змейки (движение)."""
-        head_x, head_y = self.get_head_position()
+        """
+        Обновляет позицию змейки (движение).
+        Note:
+            Сначала применяет направление, выбранное нажатием клавиши, так что
+            отдельно вызывать update_direction не нужно.
+        """
+        if self.next_direction:
+            self.direction = self.next_direction
+            self.next_direction = None
+        head_x, head_y = self.positions[0]
         dir_x, dir_y = self.direction
-        new_head_x = (head_x + dir_x * GRID_SIZE) % SCREEN_WIDTH
-        new_head_y = (head_y + dir_y * GRID_SIZE) % SCREEN_HEIGHT
+        new_head_x = head_x + dir_x
+        new_head_y = head_y + dir_y
+        # Голова выходит за край не дальше чем на одну ячейку, поэтому
+        # вместо деления по модулю достаточно вычесть/прибавить размер поля.
+        if new_head_x >= SCREEN_WIDTH:
+            new_head_x -= SCREEN_WIDTH
+        elif new_head_x < 0:
+            new_head_x += SCREEN_WIDTH
+        if new_head_y >= SCREEN_HEIGHT:
+            new_head_y -= SCREEN_HEIGHT
+        elif new_head_y < 0:
+            new_head_y += SCREEN_HEIGHT
         new_head = (new_head_x, new_head_y)
-        self.positions.insert(0, new_head)
-        if len(self.positions) > self.length:
-            self.positions.pop()
+        if len(self.positions) >= self.length:
+            self.last = self.positions.pop()
+            self._occupied.discard(self.last)
+        else:
+            self.last = None
+        self.positions.appendleft(new_head)
+        self._self_collided = new_head in self._occupied
+        self._occupied.add(new_head)
 
     def draw(self):
         """Отрисовывает змейку на экране."""
-        for position in self.positions:
-            rect = pygame.Rect(position, (GRID_SIZE, GRID_SIZE))
-            pygame.draw.rect(screen, self.body_color, rect)
-            pygame.draw.rect(screen, BORDER_COLOR, rect, 1)
+        if self.last:
+            screen.fill(BOARD_BACKGROUND_COLOR, CELL_RECTS[self.last])
+        screen.blits(
+            [(self._surf, CELL_RECTS[position])
+             for position in self.positions],
+            doreturn=False
+        )
+
+    def draw_incremental(self):
+        """
+        Перерисовывает только изменившиеся после хода ячейки змейки.
+        Returns:
+            list: Области экрана (pygame.Rect), которые нужно обновить
+        """
+        dirty = []
+        if self.last:
+            last_rect = CELL_RECTS[self.last]
+            screen.fill(BOARD_BACKGROUND_COLOR, last_rect)
+            dirty.append(last_rect)
+        dirty.append(self.draw_cell(self.positions[0]))
+        return dirty
 
     def get_head_position(self):
         """Возвращает позицию головы змейки."""
@@ -144,9 +301,12 @@ class Snake(GameObject):
     def reset(self):
         """Сбрасывает змейку в начальное состояние."""
         self.length = 1
-        self.positions = [self.position]
+        self.positions = deque([self.position])
+        self._occupied = {self.position}
+        self._self_collided = False
         self.direction = RIGHT
         self.next_direction = None
+        self.last = None
 
 
 def handle_keys(game_object):
@@ -159,15 +319,10 @@ def handle_keys(game_object):
         if event.type == pygame.QUIT:
             pygame.quit()
             raise SystemExit
-        elif event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_UP and game_object.direction != DOWN:
-                game_object.next_direction = UP
-            elif event.key == pygame.K_DOWN and game_object.direction != UP:
-                game_object.next_direction = DOWN
-            elif event.key == pygame.K_LEFT and game_object.direction != RIGHT:
-                game_object.next_direction = LEFT
-            elif event.key == pygame.K_RIGHT and game_object.direction != LEFT:
-                game_object.next_direction = RIGHT
+        # Остальные события заблокированы в main, это KEYDOWN.
+        entry = KEY_DIRS.get(event.key)
+        if entry and game_object.direction != entry[1]:
+            game_object.next_direction = entry[0]
 
 
 def check_collision(snake, apple):
@@ -190,35 +345,72 @@ def check_self_collision(snake):
     Returns:
         bool: True если змейка столкнулась с собой, иначе False
     """
-    head_position = snake.get_head_position()
-    return head_position in snake.positions[1:]
+    return snake._self_collided
+
+
+def draw_field(snake, apple):
+    """
+    Полностью перерисовывает игровое поле.
+    Args:
+        snake (Snake): Объект змейки
+        apple (Apple): Объект яблока
+    """
+    screen.fill(BOARD_BACKGROUND_COLOR)
+    apple.draw()
+    snake.draw()
+    pygame.display.update()
 
 
 def main():
     """Основная функция игры."""
     pygame.init()
+    # В очередь попадают только события, которые обрабатывает handle_keys.
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed([pygame.QUIT, pygame.KEYDOWN])
 
     snake = Snake()
-    apple = Apple(occupied_positions=snake.positions)
+    free_cells = FreeCells(ALL_CELLS - snake._occupied)
+    apple = Apple(free_cells=free_cells)
+    draw_field(snake, apple)
+
+    # Глобальные имена, нужные на каждом ходе, сохраняются в локальные
+    # переменные: поиск локального имени быстрее поиска в глобальных.
+    tick = clock.tick
+    speed = SPEED
+    keys_handler = handle_keys
+    update_display = pygame.display.update
 
     while True:
-        clock.tick(SPEED)
+        tick(speed)
 
-        handle_keys(snake)
-        snake.update_direction()
+        keys_handler(snake)
         snake.move()
-
-        if check_collision(snake, apple):
-            snake.length += 1
-            apple.randomize_position(snake.positions)
-        elif check_self_collision(snake):
+        head = snake.positions[0]
+        if snake.last:
+            free_cells.add(snake.last)
+        free_cells.discard(head)
+
+        # Проверки столкновений встроены в цикл, чтобы не вызывать
+        # check_self_collision и check_collision на каждом ходе.
+        # Если змейка заняла все поле, яблоко поставить некуда -
+        # игра начинается заново.
+        if snake._self_collided or not free_cells:
             snake.reset()
-            apple.randomize_position(snake.positions)
+            free_cells.reset(ALL_CELLS - snake._occupied)
+            apple.randomize_position(free_cells)
+            draw_field(snake, apple)
+            continue
 
-        screen.fill(BOARD_BACKGROUND_COLOR)
-        apple.draw()
-        snake.draw()
-        pygame.display.update()
+        dirty = snake.draw_incremental()
+        if head == apple.position:
+            snake.length += 1
+            apple.randomize_position(free_cells)
+            dirty.append(apple.draw())
+        elif snake.last == apple.position:
+            dirty.append(apple.draw())
+        # Если за кадр ни одна ячейка не изменилась, обновлять экран не нужно.
+        if dirty:
+            update_display(dirty)
 
 
 if __name__ == '__main__':